@@ -10,19 +10,46 @@ This module combines all AI-related functionality into a single, maintainable cl
 """
 
 import os
+import re
+import copy
+import logging
+import base64
 import json
 import random
+import time
+import hashlib
+import tempfile
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from io import BytesIO
 from PIL import Image, ImageDraw, ImageFont
+from settings import NUM_LEVELS, TEXTURE_TYPES, level_texture_types
+
+logger = logging.getLogger("ai_pipeline")
+
+# Optional fast JSON (C extension); falls back to the stdlib encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Try to import OpenAI with fallback
 try:
     import openai
     OPENAI_AVAILABLE = True
+    # Transient errors worth retrying in the pinned v0.28.1 client
+    OPENAI_RETRYABLE_ERRORS = tuple(
+        getattr(openai.error, name)
+        for name in ("RateLimitError", "APIError", "Timeout", "ServiceUnavailableError", "APIConnectionError")
+        if hasattr(getattr(openai, "error", None), name)
+    )
 except ImportError:
-    print("Warning: OpenAI package not available. Using fallback texture descriptions.")
+    logger.warning("OpenAI package not available - using fallback texture descriptions")
     OPENAI_AVAILABLE = False
+    OPENAI_RETRYABLE_ERRORS = ()
 
 # Load environment variables
 try:
@@ -31,6 +58,200 @@ try:
 except ImportError:
     pass
 
+# Upper bound on concurrent API requests (PixelLab/OpenAI rate limits apply)
+MAX_CONCURRENT_REQUESTS = 10
+
+# Request throttling, overridable per API via OPENAI_RPM / PIXEL_LAB_RPM (0 or less disables it)
+DEFAULT_REQUESTS_PER_MINUTE = 60
+
+# Retry policy for transient API failures
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 10.0
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Parsed prompt configs keyed by path, stored as (mtime, config); pipelines get
+# their own deep copy, since add_theme() edits the config in place
+_config_cache = {}
+
+# Placeholder base colors per texture type
+_TEXTURE_COLORS = {
+    "background": (135, 206, 235),  # Sky blue
+    "platform": (139, 69, 19),     # Brown
+    "enemy": (220, 20, 60),        # Crimson
+    "boss": (128, 0, 128)          # Purple
+}
+
+# Placeholder label font, loaded once per process and shared by every placeholder
+_DEFAULT_FONT = ImageFont.load_default()
+
+
+class RateLimiter:
+    """Thread-safe token bucket allowing max_rate calls per time_period seconds"""
+    
+    def __init__(self, max_rate, time_period=60.0):
+        self.max_rate = max_rate
+        self.fill_rate = max_rate / time_period
+        self._tokens = float(max_rate)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a call is allowed"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.max_rate, self._tokens + (now - self._last_refill) * self.fill_rate)
+                self._last_refill = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                wait_time = (1 - self._tokens) / self.fill_rate
+            time.sleep(wait_time)
+
+
+def _rate_limiter_from_env(env_var):
+    """
+    Build a RateLimiter from a requests-per-minute environment variable
+    Returns: RateLimiter, or None when throttling is disabled
+    """
+    value = os.environ.get(env_var)
+    max_rate = DEFAULT_REQUESTS_PER_MINUTE
+    if value is not None:
+        try:
+            max_rate = int(value)
+        except ValueError:
+            logger.warning("Invalid %s=%r - using %d requests per minute", env_var, value, DEFAULT_REQUESTS_PER_MINUTE)
+    
+    if max_rate <= 0:
+        return None
+    return RateLimiter(max_rate)
+
+
+def _json_dumps(obj, indent=False):
+    """Serialize obj to UTF-8 JSON bytes (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+
+def _json_loads(data):
+    """Parse JSON bytes (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _write_json(path, obj, indent=False):
+    """Write obj as JSON to path with a single buffered write"""
+    with open(path, 'wb') as f:
+        f.write(_json_dumps(obj, indent))
+
+
+def _is_retryable_request_error(error):
+    """Timeouts, dropped connections, 429 and 5xx responses are worth retrying"""
+    if isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    return False
+
+
+def _is_retryable_openai_error(error):
+    """Rate limits and transient server errors from OpenAI are worth retrying"""
+    return isinstance(error, OPENAI_RETRYABLE_ERRORS)
+
+
+def _call_with_retries(func, is_retryable, rate_limiter=None):
+    """Call func, retrying transient failures with exponential backoff and jitter"""
+    for attempt in range(1, RETRY_ATTEMPTS + 1):
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        
+        try:
+            return func()
+        except Exception as e:
+            if attempt == RETRY_ATTEMPTS or not is_retryable(e):
+                raise
+            
+            delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1))
+            delay += random.uniform(0, delay)
+            logger.warning("Transient API error (%s), retrying in %.1fs", e, delay)
+            time.sleep(delay)
+
+
+def _draw_background(size, base_color):
+    """Gradient-like horizontal bands"""
+    width, height = size
+    image = Image.new('RGB', size, color=base_color)
+    for i in range(0, height, 20):
+        color_intensity = int(255 * (1 - i / height))
+        image.paste((color_intensity, color_intensity // 2, color_intensity // 3),
+                    (0, i, width, min(height, i + 11)))
+    return image
+
+
+def _draw_platform(size, base_color):
+    """Block pattern: draw one outlined 32x16 block, repeat it into a strip, then repeat the strip"""
+    width, height = size
+    block = Image.new('RGB', (32, 16), color=base_color)
+    ImageDraw.Draw(block).rectangle([0, 0, 30, 14], outline=(255, 255, 255), width=2)
+    block_data = block.tobytes()
+    repeats = -(-width // 32)
+    strip = b"".join((block_data[r * 96:(r + 1) * 96] * repeats)[:width * 3] for r in range(16))
+    return Image.frombytes('RGB', size, (strip * -(-height // 16))[:width * height * 3])
+
+
+def _draw_character(size, base_color):
+    """Simple character outline"""
+    width, height = size
+    image = Image.new('RGB', size, color=base_color)
+    center_x, center_y = width // 2, height // 2
+    radius = min(size) // 4
+    ImageDraw.Draw(image).ellipse([center_x - radius, center_y - radius, 
+                                   center_x + radius, center_y + radius], 
+                                  fill=(255, 100, 100), outline=(255, 255, 255), width=3)
+    return image
+
+
+def _draw_plain(size, base_color):
+    """Solid fill for texture types without a pattern"""
+    return Image.new('RGB', size, color=base_color)
+
+
+# Placeholder pattern per texture type; register new types here
+_PLACEHOLDER_DRAWERS = {
+    "background": _draw_background,
+    "platform": _draw_platform,
+    "enemy": _draw_character,
+    "boss": _draw_character,
+}
+
+
+def _render_placeholder(texture_type, level_num, size):
+    """Draw a labelled placeholder texture"""
+    draw_pattern = _PLACEHOLDER_DRAWERS.get(texture_type, _draw_plain)
+    image = draw_pattern(size, _TEXTURE_COLORS.get(texture_type, (128, 128, 128)))
+    
+    # Add text label
+    draw = ImageDraw.Draw(image)
+    text = f"{texture_type.upper()}\nL{level_num}"
+    bbox = draw.textbbox((0, 0), text, font=_DEFAULT_FONT)
+    text_x = (size[0] - (bbox[2] - bbox[0])) // 2
+    text_y = (size[1] - (bbox[3] - bbox[1])) // 2
+    draw.text((text_x, text_y), text, fill=(255, 255, 255), font=_DEFAULT_FONT)
+    
+    return image
+
+
+def _encode_png(image):
+    """Encode an image as PNG bytes (fast zlib level; these textures are small)"""
+    buffer = BytesIO()
+    image.save(buffer, format="PNG", optimize=False, compress_level=1)
+    return buffer.getvalue()
+
 
 class AITexturePipeline:
     """
@@ -51,6 +272,25 @@ class AITexturePipeline:
         # Initialize OpenAI
         self._setup_openai()
         
+        # Shared HTTP session so concurrent PixelLab calls reuse keep-alive connections;
+        # the pool holds one connection per worker and retries are handled by _call_with_retries
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=MAX_CONCURRENT_REQUESTS,
+                              pool_maxsize=MAX_CONCURRENT_REQUESTS,
+                              max_retries=0)
+        self._http.mount("https://", adapter)
+        self._http.mount("http://", adapter)
+        
+        # Built once; not set on the session so the key never goes to image download URLs
+        self._pixellab_headers = {
+            "Authorization": f"Bearer {self.pixellab_key}",
+            "Content-Type": "application/json"
+        }
+        
+        # Proactive throttling so concurrent workers stay under the API rate limits
+        self._openai_limiter = _rate_limiter_from_env("OPENAI_RPM")
+        self._pixellab_limiter = _rate_limiter_from_env("PIXEL_LAB_RPM")
+        
         # Setup directories
         self.base_dir = os.path.dirname(__file__)
         self.texture_dir = os.path.join(self.base_dir, "assets", "textures")
@@ -61,34 +301,55 @@ class AITexturePipeline:
         # Load prompt configuration
         self.prompt_config = self._load_prompt_config()
         self.current_theme = "desert ruins"  # Default theme
+        self._cache_theme_data()
         
-        # Cache for generated descriptions
-        self.description_cache = {}
+        # Persistent cache for generated descriptions (shared across worker threads)
+        self._desc_cache_path = os.path.join(self.base_dir, ".desc_cache.json")
+        self.description_cache = self._load_description_cache()
+        self._cache_lock = threading.Lock()
+        
+        # Generated images memoized by prompt hash, so identical prompts only hit PixelLab once;
+        # each is its own file, since the per-level game files get overwritten
+        self.image_cache_dir = os.path.join(self.texture_dir, "cache")
+        os.makedirs(self.image_cache_dir, exist_ok=True)
+        self._image_prompt_locks = {}
         
         # Texture types
-        self.texture_types = ["background", "platform", "enemy", "boss"]
+        self.texture_types = list(TEXTURE_TYPES)
         
-        print("🚀 AI Texture Pipeline initialized successfully")
+        logger.info("AI Texture Pipeline initialized")
     
     def _setup_openai(self):
         """Setup OpenAI API with proper version handling"""
         if not self.openai_key or not OPENAI_AVAILABLE:
-            print("⚠️ OpenAI API key not available - using fallback descriptions")
+            logger.warning("OpenAI API key not available - using fallback descriptions")
             return
         
         # For OpenAI v0.28.1, use the old API format
         openai.api_key = self.openai_key
-        print("✅ OpenAI API (v0.28.1) initialized successfully")
+        logger.info("OpenAI API (v0.28.1) initialized")
     
     def _load_prompt_config(self):
         """Load prompt configuration from JSON file"""
         config_path = os.path.join(self.base_dir, "prompt_config.json")
         try:
-            with open(config_path, 'r') as f:
-                return json.load(f)
+            mtime = os.stat(config_path).st_mtime
         except FileNotFoundError:
             # Return default configuration if file not found
             return self._get_default_prompt_config()
+        
+        # Reuse the parsed config unless the file changed since it was read
+        cached = _config_cache.get(config_path)
+        if cached is None or cached[0] != mtime:
+            with open(config_path, 'rb') as f:
+                cached = (mtime, _json_loads(f.read()))
+            _config_cache[config_path] = cached
+        return copy.deepcopy(cached[1])
+    
+    def _cache_theme_data(self):
+        """Resolve the current theme's config once instead of on every prompt"""
+        self._theme_data = self.prompt_config["themes"].get(self.current_theme, {})
+        self._theme_desc = self._theme_data.get("description", "generic game environment")
     
     def _get_default_prompt_config(self):
         """Return default prompt configuration"""
@@ -117,125 +378,250 @@ class AITexturePipeline:
             }
         }
     
-    def generate_all_textures(self, num_levels=3):
+    def generate_all_textures(self, num_levels=NUM_LEVELS, force=False, levels=None):
         """
-        Generate all textures for all levels
+        Generate all textures for all levels (or only the given level numbers)
+        Levels whose textures already exist on disk are reused unless force=True, which also
+        bypasses the description and image caches so regeneration calls the APIs again
         Returns: dict of texture files organized by level
         """
-        print(f"🎨 Generating textures with theme: {self.current_theme}")
+        logger.info("Generating textures with theme: %s", self.current_theme)
+        
+        if levels is None:
+            levels = range(1, num_levels + 1)
+        texture_files = {level_num: {} for level_num in levels}
         
-        texture_files = {}
+        with os.scandir(self.texture_dir) as entries:
+            existing_files = {entry.name for entry in entries}
         
-        for level_num in range(1, num_levels + 1):
-            print(f"\n📁 Generating Level {level_num} textures...")
-            texture_files[level_num] = {}
+        levels_to_generate = []
+        for level_num in texture_files:
+            filenames = {
+                texture_type: f"level_{level_num}_{texture_type}.png"
+                for texture_type in level_texture_types(level_num, num_levels)
+            }
             
-            # Generate descriptions first
-            descriptions = self._generate_level_descriptions(level_num)
+            if not force and all(name in existing_files for name in filenames.values()):
+                # Already generated - skip the API calls entirely
+                logger.info("Reusing existing level %d textures", level_num)
+                texture_files[level_num] = {
+                    texture_type: os.path.join(self.texture_dir, name)
+                    for texture_type, name in filenames.items()
+                }
+            else:
+                levels_to_generate.append(level_num)
+        
+        if not levels_to_generate:
+            return texture_files
+        
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            futures = {}
             
-            # Generate images for each texture type
-            for texture_type in self.texture_types:
-                # Skip boss texture for non-final levels
-                if texture_type == "boss" and level_num != num_levels:
-                    continue
+            # Start each level's images as soon as its descriptions arrive instead of
+            # waiting for every level's OpenAI request to finish
+            for level_num, descriptions in self._iter_descriptions(levels_to_generate, num_levels, force):
+                logger.info("Preparing level %d textures", level_num)
                 
-                description = descriptions.get(texture_type, f"Default {texture_type}")
-                prompt = self._create_image_prompt(description, texture_type)
+                for texture_type in level_texture_types(level_num, num_levels):
+                    description = descriptions.get(texture_type, f"Default {texture_type}")
+                    prompt = self._create_image_prompt(description, texture_type)
+                    if self.pixellab_key:
+                        # Image generation is I/O-bound, so overlap the API round-trips
+                        future = executor.submit(self._generate_texture_image, prompt, texture_type, level_num,
+                                                 force=force)
+                        futures[future] = (level_num, texture_type)
+                    else:
+                        # Placeholders take a few milliseconds each, so draw them right here
+                        _, filename = self._generate_texture_image(prompt, texture_type, level_num)
+                        texture_files[level_num][texture_type] = filename
                 
-                # Generate the texture image
-                image, filename = self._generate_texture_image(prompt, texture_type, level_num)
-                texture_files[level_num][texture_type] = filename
+                # Save descriptions to file
+                self._save_descriptions(descriptions, level_num)
             
-            # Save descriptions to file
-            self._save_descriptions(descriptions, level_num)
+            for future in as_completed(futures):
+                level_num, texture_type = futures[future]
+                try:
+                    _, filename = future.result()
+                except Exception as e:
+                    # One failed texture must not abort the whole batch
+                    logger.error("Texture generation failed for %s level %d: %s", texture_type, level_num, e)
+                    _, filename = self._generate_placeholder_image(texture_type, level_num)
+                texture_files[level_num][texture_type] = filename
         
-        print("\n✅ Generated textures for all levels")
+        logger.info("Generated textures for all levels")
         return texture_files
     
-    def _generate_level_descriptions(self, level_num):
-        """Generate AI descriptions for all textures in a level"""
-        cache_key = f"{self.current_theme}_{level_num}"
-        
-        if cache_key in self.description_cache:
-            return self.description_cache[cache_key]
-        
-        descriptions = {}
-        is_final_level = (level_num == 3)  # Assuming 3 levels
+    def _iter_descriptions(self, level_nums, num_levels=NUM_LEVELS, force=False):
+        """
+        Yield (level_num, descriptions) as each level's descriptions become available
+        Cached levels are yielded immediately; OpenAI requests for the rest run concurrently
+        (force=True ignores cached descriptions, but still writes the new ones through)
+        """
+        pending = {}
         
-        for texture_type in self.texture_types:
-            # Skip boss for non-final levels
-            if texture_type == "boss" and not is_final_level:
-                continue
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            for level_num in level_nums:
+                is_final_level = (level_num == num_levels)
+                
+                # Skip boss for non-final levels
+                texture_types = level_texture_types(level_num, num_levels)
+                
+                descriptions = {}
+                missing = []
+                with self._cache_lock:
+                    for texture_type in texture_types:
+                        if force:
+                            missing.append(texture_type)
+                            continue
+                        cached = self.description_cache.get(self._description_cache_key(texture_type, level_num))
+                        if cached is not None:
+                            descriptions[texture_type] = cached
+                        else:
+                            missing.append(texture_type)
+                
+                # One OpenAI request covers every uncached texture type of the level
+                if missing:
+                    future = executor.submit(self._generate_ai_descriptions, missing, level_num, is_final_level)
+                    pending[future] = (level_num, texture_types, descriptions)
+                else:
+                    yield level_num, descriptions
             
-            # Generate description using OpenAI or fallback
-            description = self._generate_ai_description(texture_type, level_num, is_final_level)
-            descriptions[texture_type] = description
-        
-        # Cache the descriptions
-        self.description_cache[cache_key] = descriptions
-        return descriptions
+            for future in as_completed(pending):
+                level_num, texture_types, descriptions = pending[future]
+                generated = future.result()
+                if generated:
+                    # Write through so later runs skip the API entirely
+                    with self._cache_lock:
+                        for texture_type, description in generated.items():
+                            self.description_cache[self._description_cache_key(texture_type, level_num)] = description
+                        self._save_description_cache()
+                descriptions.update(generated)
+                
+                # Anything the API did not provide uses the configured fallback
+                yield level_num, {
+                    t: descriptions.get(t) or self._get_fallback_description(t, level_num)
+                    for t in texture_types
+                }
+    
+    def _description_cache_key(self, texture_type, level_num):
+        """Stable cache key for a (theme, level, texture type) description"""
+        key_data = json.dumps({"theme": self.current_theme, "type": texture_type, "level": level_num}, sort_keys=True)
+        return hashlib.sha256(key_data.encode("utf-8")).hexdigest()
+    
+    def _load_description_cache(self):
+        """Load previously generated descriptions from disk"""
+        try:
+            with open(self._desc_cache_path, 'rb') as f:
+                return _json_loads(f.read())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+    
+    def _save_description_cache(self):
+        """Atomically write the description cache to disk (caller holds the cache lock)"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.base_dir, prefix=".desc_cache.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_json_dumps(self.description_cache))
+            os.replace(tmp_path, self._desc_cache_path)
+        except OSError as e:
+            logger.warning("Could not save description cache: %s", e)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
     
-    def _generate_ai_description(self, texture_type, level_num, is_final_level):
-        """Generate AI description using OpenAI API or fallback"""
+    def _generate_ai_descriptions(self, texture_types, level_num, is_final_level):
+        """
+        Generate AI descriptions for several texture types in a single OpenAI request
+        Returns: dict of the descriptions the API provided (empty if unavailable)
+        """
         if not self.openai_key or not OPENAI_AVAILABLE:
-            return self._get_fallback_description(texture_type, level_num)
+            return {}
+        
+        # Leave room for one paragraph per texture type plus the JSON wrapping
+        max_tokens = 150 * len(texture_types) + 50
         
         try:
             # Create prompt for OpenAI
-            prompt = self._create_description_prompt(texture_type, level_num, is_final_level)
+            prompt = self._create_description_prompt(texture_types, level_num, is_final_level)
             
             # Use OpenAI v0.28.1 API format
             if hasattr(openai, 'ChatCompletion'):
-                response = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "You are a game asset designer specializing in pixel art descriptions."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=150,
-                    temperature=0.7
+                response = _call_with_retries(
+                    lambda: openai.ChatCompletion.create(
+                        model="gpt-3.5-turbo",
+                        messages=[
+                            {"role": "system", "content": "You are a game asset designer specializing in pixel art descriptions."},
+                            {"role": "user", "content": prompt}
+                        ],
+                        max_tokens=max_tokens,
+                        temperature=0.7
+                    ),
+                    _is_retryable_openai_error,
+                    self._openai_limiter
                 )
-                description = response.choices[0].message.content.strip()
-                print(f"✅ Generated AI description for {texture_type} (level {level_num})")
-                return description
+                content = response.choices[0].message.content
             else:
                 # Fallback to Completion API
-                response = openai.Completion.create(
-                    engine="text-davinci-003",
-                    prompt=f"You are a game asset designer specializing in pixel art descriptions.\n\n{prompt}",
-                    max_tokens=150,
-                    temperature=0.7
+                response = _call_with_retries(
+                    lambda: openai.Completion.create(
+                        engine="text-davinci-003",
+                        prompt=f"You are a game asset designer specializing in pixel art descriptions.\n\n{prompt}",
+                        max_tokens=max_tokens,
+                        temperature=0.7
+                    ),
+                    _is_retryable_openai_error,
+                    self._openai_limiter
                 )
-                description = response.choices[0].text.strip()
-                print(f"✅ Generated AI description for {texture_type} (level {level_num})")
-                return description
+                content = response.choices[0].text
+            
+            descriptions = self._parse_descriptions(content, texture_types)
+            logger.info("Generated AI descriptions for level %d", level_num)
+            return descriptions
                 
         except Exception as e:
-            print(f"OpenAI API error: {e}")
-            return self._get_fallback_description(texture_type, level_num)
+            logger.error("OpenAI API error: %s", e)
+            return {}
     
-    def _create_description_prompt(self, texture_type, level_num, is_final_level):
-        """Create prompt for OpenAI description generation"""
-        theme_data = self.prompt_config["themes"].get(self.current_theme, {})
-        theme_desc = theme_data.get("description", "generic game environment")
+    def _parse_descriptions(self, content, texture_types):
+        """Parse the JSON object returned by OpenAI, keeping only non-empty descriptions"""
+        # The v0.28.1 API has no JSON mode, so pull the object out of any surrounding prose
+        match = re.search(r"\{.*\}", content, re.DOTALL)
+        parsed = json.loads(match.group(0)) if match else {}
         
-        base_prompt = f"Create a detailed description for a {texture_type} texture in a {theme_desc} themed level {level_num} of a 2D platformer game."
+        descriptions = {}
+        for texture_type in texture_types:
+            description = parsed.get(texture_type)
+            if isinstance(description, str) and description.strip():
+                descriptions[texture_type] = description.strip()
+        return descriptions
+    
+    def _create_description_prompt(self, texture_types, level_num, is_final_level):
+        """Create a single prompt asking OpenAI for descriptions of several texture types"""
+        lines = [
+            f"Create detailed descriptions for the textures of a {self._theme_desc} themed level {level_num} of a 2D platformer game."
+        ]
+        
+        for texture_type in texture_types:
+            if texture_type == "background":
+                lines.append("- background: The background should set the mood and atmosphere for the level.")
+            elif texture_type == "platform":
+                lines.append("- platform: The platform should be sturdy and fit the theme, suitable for jumping.")
+            elif texture_type == "enemy":
+                lines.append("- enemy: The enemy should be challenging but not overwhelming, fitting the theme.")
+            elif texture_type == "boss" and is_final_level:
+                lines.append("- boss: This is the final boss - make it imposing, large, and thematically appropriate.")
+            else:
+                lines.append(f"- {texture_type}")
         
-        if texture_type == "background":
-            return f"{base_prompt} The background should set the mood and atmosphere for the level."
-        elif texture_type == "platform":
-            return f"{base_prompt} The platform should be sturdy and fit the theme, suitable for jumping."
-        elif texture_type == "enemy":
-            return f"{base_prompt} The enemy should be challenging but not overwhelming, fitting the theme."
-        elif texture_type == "boss" and is_final_level:
-            return f"{base_prompt} This is the final boss - make it imposing, large, and thematically appropriate."
+        keys = ", ".join(f'"{t}"' for t in texture_types)
+        lines.append(
+            f"Return only a JSON object with the keys {keys}, each mapped to a one-paragraph description."
+        )
         
-        return base_prompt
+        return "\n".join(lines)
     
     def _get_fallback_description(self, texture_type, level_num):
         """Get fallback description when AI is not available"""
-        theme_data = self.prompt_config["themes"].get(self.current_theme, {})
-        prompts = theme_data.get("prompts", {})
+        prompts = self._theme_data.get("prompts", {})
         
         return prompts.get(texture_type, f"A {texture_type} for level {level_num}")
     
@@ -246,23 +632,35 @@ class AITexturePipeline:
         
         return f"{base_style}, {description}, {quality_terms}"
     
-    def _generate_texture_image(self, prompt, texture_type, level_num, size=(256, 256)):
-        """Generate texture image using PixelLab API or fallback"""
+    def _generate_texture_image(self, prompt, texture_type, level_num, size=(256, 256), force=False):
+        """Generate texture image using PixelLab API or fallback (force=True skips the image cache)"""
         if not self.pixellab_key:
-            print(f"No PixelLab API key - using placeholder for {texture_type} level {level_num}")
+            logger.info("No PixelLab API key - using placeholder for %s level %d", texture_type, level_num)
             return self._generate_placeholder_image(texture_type, level_num, size)
         
+        prompt_hash = self._image_cache_key(prompt, size)
+        with self._cache_lock:
+            prompt_lock = self._image_prompt_locks.setdefault(prompt_hash, threading.Lock())
+        
+        # Hold the per-prompt lock so concurrent workers with the same prompt wait for one API call
+        with prompt_lock:
+            if not force:
+                cached = self._load_cached_image(prompt_hash, texture_type, level_num)
+                if cached is not None:
+                    return cached
+            return self._request_texture_image(prompt, prompt_hash, texture_type, level_num, size)
+    
+    def _request_texture_image(self, prompt, prompt_hash, texture_type, level_num, size):
+        """Call PixelLab for a texture image, falling back to a placeholder on failure"""
         try:
-            print(f"🎨 Calling PixelLab API for {texture_type} in level {level_num}")
-            print(f"📝 Prompt: {prompt}")
+            logger.info("Calling PixelLab API for %s level %d", texture_type, level_num)
+            logger.debug("PixelLab prompt for %s level %d: %s", texture_type, level_num, prompt)
             
             # Make the actual API call to PixelLab
-            response = requests.post(
+            response = self._pixellab_request(
+                "POST",
                 "https://api.pixellab.ai/v1/generate",
-                headers={
-                    "Authorization": f"Bearer {self.pixellab_key}",
-                    "Content-Type": "application/json"
-                },
+                headers=self._pixellab_headers,
                 json={
                     "prompt": prompt,
                     "width": size[0],
@@ -278,78 +676,86 @@ class AITexturePipeline:
                 
                 # Handle different response formats
                 if "image" in result:
-                    import base64
-                    image_data = base64.b64decode(result["image"])
-                    image = Image.open(BytesIO(image_data))
+                    image = Image.open(BytesIO(base64.b64decode(result["image"])))
                 elif "url" in result:
-                    img_response = requests.get(result["url"], timeout=30)
+                    img_response = self._pixellab_request("GET", result["url"], throttle=False, timeout=30)
+                    # Fail on error pages instead of handing them to Pillow
+                    img_response.raise_for_status()
                     image = Image.open(BytesIO(img_response.content))
                 else:
                     raise ValueError("Unexpected API response format")
                 
-                # Save the real AI-generated image
-                filename = self._save_texture_image(image, texture_type, level_num)
-                print(f"✅ Generated real AI texture: {filename}")
+                # Save the real AI-generated image, plus a copy under its prompt hash
+                # (placeholders never reach the cache)
+                data = _encode_png(image)
+                self._store_cached_image(prompt_hash, data)
+                filename = self._write_texture_bytes(data, texture_type, level_num)
+                logger.info("Generated AI texture: %s", filename)
                 
                 return image, filename
                 
             else:
-                print(f"❌ PixelLab API error {response.status_code}: {response.text}")
-                print(f"🔄 Falling back to placeholder generation")
+                logger.error("PixelLab API error %s for %s level %d, using placeholder: %s",
+                             response.status_code, texture_type, level_num, response.text)
                 
         except requests.exceptions.RequestException as e:
-            print(f"❌ PixelLab API request failed: {e}")
-            print(f"🔄 Falling back to placeholder generation")
+            logger.error("PixelLab API request failed for %s level %d, using placeholder: %s", texture_type, level_num, e)
         except Exception as e:
-            print(f"❌ PixelLab API error: {e}")
-            print(f"🔄 Falling back to placeholder generation")
+            logger.error("PixelLab API error for %s level %d, using placeholder: %s", texture_type, level_num, e)
         
         # Fallback to placeholder
-        print(f"🎨 Generating placeholder for {texture_type} level {level_num}")
+        logger.info("Generating placeholder for %s level %d", texture_type, level_num)
         return self._generate_placeholder_image(texture_type, level_num, size)
     
+    def _image_cache_key(self, prompt, size):
+        """Stable hash of the final image prompt and requested size"""
+        return hashlib.sha256(f"{size[0]}x{size[1]}:{prompt}".encode("utf-8")).hexdigest()
+    
+    def _image_cache_file(self, prompt_hash):
+        """Path of the cached image for a prompt hash"""
+        return os.path.join(self.image_cache_dir, f"{prompt_hash}.png")
+    
+    def _load_cached_image(self, prompt_hash, texture_type, level_num):
+        """
+        Reuse a previously generated image for an identical prompt
+        Returns: (image, filename) or None on a cache miss
+        """
+        try:
+            with open(self._image_cache_file(prompt_hash), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        
+        filename = self._write_texture_bytes(data, texture_type, level_num)
+        logger.info("Reused cached AI texture for %s level %d: %s", texture_type, level_num, filename)
+        return Image.open(BytesIO(data)), filename
+    
+    def _store_cached_image(self, prompt_hash, data):
+        """Atomically write an API-generated image to the cache under its prompt hash"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.image_cache_dir, prefix=f".{prompt_hash}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._image_cache_file(prompt_hash))
+        except OSError as e:
+            logger.warning("Could not save cached image: %s", e)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    def _pixellab_request(self, method, url, throttle=True, **kwargs):
+        """Send a PixelLab HTTP request, retrying transient failures"""
+        def send():
+            response = self._http.request(method, url, **kwargs)
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                response.raise_for_status()
+            return response
+        
+        rate_limiter = self._pixellab_limiter if throttle else None
+        return _call_with_retries(send, _is_retryable_request_error, rate_limiter)
+    
     def _generate_placeholder_image(self, texture_type, level_num, size=(256, 256)):
         """Generate a placeholder image for testing"""
-        # Create a colorful placeholder image
-        image = Image.new('RGB', size, color=self._get_texture_color(texture_type))
-        draw = ImageDraw.Draw(image)
-        
-        # Add some simple patterns
-        if texture_type == "background":
-            # Gradient-like effect
-            for i in range(0, size[1], 20):
-                color_intensity = int(255 * (1 - i / size[1]))
-                draw.rectangle([0, i, size[0], i + 10], 
-                             fill=(color_intensity, color_intensity // 2, color_intensity // 3))
-        elif texture_type == "platform":
-            # Block pattern
-            for x in range(0, size[0], 32):
-                for y in range(0, size[1], 16):
-                    draw.rectangle([x, y, x + 30, y + 14], 
-                                 outline=(255, 255, 255), width=2)
-        elif texture_type in ["enemy", "boss"]:
-            # Simple character outline
-            center_x, center_y = size[0] // 2, size[1] // 2
-            radius = min(size) // 4
-            draw.ellipse([center_x - radius, center_y - radius, 
-                         center_x + radius, center_y + radius], 
-                        fill=(255, 100, 100), outline=(255, 255, 255), width=3)
-        
-        # Add text label
-        try:
-            # Try to load a font, fall back to default if not available
-            font = ImageFont.load_default()
-        except:
-            font = None
-        
-        text = f"{texture_type.upper()}\nL{level_num}"
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        text_x = (size[0] - text_width) // 2
-        text_y = (size[1] - text_height) // 2
-        
-        draw.text((text_x, text_y), text, fill=(255, 255, 255), font=font)
+        image = _render_placeholder(texture_type, level_num, size)
         
         # Save the image
         filename = self._save_texture_image(image, texture_type, level_num)
@@ -358,16 +764,15 @@ class AITexturePipeline:
     
     def _get_texture_color(self, texture_type):
         """Get base color for texture type"""
-        colors = {
-            "background": (135, 206, 235),  # Sky blue
-            "platform": (139, 69, 19),     # Brown
-            "enemy": (220, 20, 60),        # Crimson
-            "boss": (128, 0, 128)          # Purple
-        }
-        return colors.get(texture_type, (128, 128, 128))
+        return _TEXTURE_COLORS.get(texture_type, (128, 128, 128))
     
     def _save_texture_image(self, image, texture_type, level_num):
         """Save texture image to both game and verification directories"""
+        # Encode once and write the bytes to both locations
+        return self._write_texture_bytes(_encode_png(image), texture_type, level_num)
+    
+    def _texture_paths(self, texture_type, level_num):
+        """Game and verification file paths for a texture"""
         # Game texture filename
         game_filename = os.path.join(self.texture_dir, f"level_{level_num}_{texture_type}.png")
         
@@ -376,31 +781,34 @@ class AITexturePipeline:
             self.verification_dir, 
             f"pixellab_level_{level_num}_{texture_type}.png"
         )
+        return game_filename, verification_filename
+    
+    def _write_texture_bytes(self, data, texture_type, level_num):
+        """Write encoded PNG bytes to both game and verification directories"""
+        game_filename, verification_filename = self._texture_paths(texture_type, level_num)
         
-        # Save to both locations
-        image.save(game_filename)
-        image.save(verification_filename)
+        for path in (game_filename, verification_filename):
+            with open(path, 'wb') as f:
+                f.write(data)
         
-        print(f"📋 Verification copy: {verification_filename}")
+        logger.debug("Verification copy: %s", verification_filename)
         
         return game_filename
     
     def _save_descriptions(self, descriptions, level_num):
         """Save texture descriptions to JSON file"""
         filename = os.path.join(self.texture_dir, f"level_{level_num}_descriptions.json")
-        with open(filename, 'w') as f:
-            json.dump(descriptions, f, indent=2)
-        print(f"💾 Saved level {level_num} descriptions to {filename}")
+        _write_json(filename, descriptions, indent=True)
+        logger.info("Saved level %d descriptions to %s", level_num, filename)
     
     def set_theme(self, theme_name):
         """Change the current theme"""
         if theme_name in self.prompt_config["themes"]:
             self.current_theme = theme_name
-            # Clear cache when theme changes
-            self.description_cache.clear()
-            print(f"🎨 Theme changed to: {theme_name}")
+            self._cache_theme_data()
+            logger.info("Theme changed to: %s", theme_name)
         else:
-            print(f"❌ Theme '{theme_name}' not found")
+            logger.error("Theme %r not found", theme_name)
     
     def get_available_themes(self):
         """Get list of available themes"""
@@ -410,13 +818,15 @@ class AITexturePipeline:
         """Add a new theme to the configuration"""
         self.prompt_config["themes"][theme_name] = theme_data
         self._save_prompt_config()
-        print(f"✅ Added new theme: {theme_name}")
+        if theme_name == self.current_theme:
+            self._cache_theme_data()
+        logger.info("Added new theme: %s", theme_name)
     
     def _save_prompt_config(self):
         """Save prompt configuration to file"""
         config_path = os.path.join(self.base_dir, "prompt_config.json")
-        with open(config_path, 'w') as f:
-            json.dump(self.prompt_config, f, indent=2)
+        _write_json(config_path, self.prompt_config, indent=True)
+        _config_cache[config_path] = (os.stat(config_path).st_mtime, copy.deepcopy(self.prompt_config))
 
 
 # Convenience function for backward compatibility
@@ -426,10 +836,12 @@ def create_ai_pipeline():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    
     # Test the pipeline
     pipeline = AITexturePipeline()
     print(f"Available themes: {pipeline.get_available_themes()}")
     
     # Generate textures for testing
-    texture_files = pipeline.generate_all_textures(num_levels=3)
+    texture_files = pipeline.generate_all_textures(num_levels=NUM_LEVELS)
     print(f"Generated texture files: {texture_files}")
@@ -10,9 +10,42 @@ This module provides performance optimizations including:
 """
 
 import os
+import atexit
+import logging
+import logging.handlers
+import queue
 import threading
 import time
-from ai_pipeline import AITexturePipeline
+from settings import NUM_LEVELS, level_texture_types
+
+
+logger = logging.getLogger("game_manager")
+
+TEXTURE_DIR = os.path.join(os.path.dirname(__file__), "assets", "textures")
+
+# Level numbers with AI textures (texture types per level come from settings.level_texture_types)
+LEVEL_NUMS = range(1, NUM_LEVELS + 1)
+
+
+def _setup_queued_logging():
+    """
+    Route log records through a queue so texture worker threads only enqueue them
+    and a single background listener does the I/O with the root handlers
+    (the application's own logging configuration is kept, just moved behind the queue)
+    """
+    root_logger = logging.getLogger()
+    handlers = root_logger.handlers[:]
+    if not handlers or any(isinstance(h, logging.handlers.QueueHandler) for h in handlers):
+        # Nothing configured yet, or already queued
+        return
+    
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    for handler in handlers:
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop)
 
 
 class GameManager:
@@ -21,23 +54,34 @@ class GameManager:
     """
     _instance = None
     _initialized = False
+    _lock = threading.Lock()
     
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(GameManager, cls).__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(GameManager, cls).__new__(cls)
         return cls._instance
     
     def __init__(self):
-        if not GameManager._initialized:
+        if GameManager._initialized:
+            return
+        with GameManager._lock:
+            if GameManager._initialized:
+                return
             print("🚀 Initializing Game Manager...")
             
-            # Singleton AI pipeline - initialize once, use everywhere
-            self.ai_pipeline = AITexturePipeline()
+            # Singleton AI pipeline - created on first use, since textures
+            # already on disk never need it
+            self._ai_pipeline = None
             
-            # Texture cache and status
+            # Texture cache and per-level status, so entering a level only waits
+            # for that level's textures
             self.texture_cache = {}
-            self.textures_loading = False
-            self.textures_ready = False
+            self._level_ready_events = {level_num: threading.Event() for level_num in LEVEL_NUMS}
+            self._levels_loading = set()
+            # Guards the loading state so concurrent callers start only one loader per level
+            self._loading_lock = threading.RLock()
             
             # Level cache
             self.level_cache = {}
@@ -45,106 +89,116 @@ class GameManager:
             # Performance metrics
             self.load_times = {}
             
-            # Start background texture loading
-            self._start_background_loading()
-            
             GameManager._initialized = True
             print("✅ Game Manager initialized")
     
-    def _start_background_loading(self):
-        """Start loading textures in the background"""
-        if not self.textures_ready and not self.textures_loading:
-            self.textures_loading = True
-            thread = threading.Thread(target=self._load_textures_async, daemon=True)
+    @property
+    def ai_pipeline(self):
+        """Singleton AI pipeline, created on first access"""
+        if self._ai_pipeline is None:
+            # Imported here so games whose textures are already on disk never pay for
+            # loading requests/PIL/openai
+            from ai_pipeline import AITexturePipeline
+            self._ai_pipeline = AITexturePipeline()
+        return self._ai_pipeline
+    
+    @property
+    def textures_ready(self):
+        """Whether every level's textures have been loaded"""
+        return all(event.is_set() for event in self._level_ready_events.values())
+    
+    @property
+    def textures_loading(self):
+        """Whether any level's textures are still being loaded"""
+        return bool(self._levels_loading)
+    
+    def start(self, preload=True):
+        """
+        Start background texture loading for every level (a loading-screen prewarm);
+        with preload=False textures are only loaded as each level is first requested
+        """
+        # Logging is configured by now, so the loader threads can log through the queue
+        _setup_queued_logging()
+        
+        if preload:
+            for level_num in LEVEL_NUMS:
+                self._start_background_loading(level_num)
+    
+    def _start_background_loading(self, level_num, force=False):
+        """Start loading one level's textures in the background (force=True regenerates them)"""
+        with self._loading_lock:
+            if self._level_ready_events[level_num].is_set() or level_num in self._levels_loading:
+                return
+            self._levels_loading.add(level_num)
+            thread = threading.Thread(target=self._load_textures_async, args=(level_num, force), daemon=True)
             thread.start()
-            print("🔄 Started background texture loading...")
+        logger.debug("Started background texture loading for level %d", level_num)
     
-    def _load_textures_async(self):
-        """Load textures asynchronously in background"""
+    def _load_textures_async(self, level_num, force=False):
+        """Load one level's textures asynchronously in background"""
         try:
             start_time = time.time()
             
             # Check if textures already exist on disk
-            if self._textures_exist_on_disk():
-                print("📁 Loading existing textures from disk...")
-                self.texture_cache = self._load_existing_textures()
+            if not force and self._textures_exist_on_disk(level_num):
+                logger.debug("Loading existing level %d textures from disk", level_num)
+                textures = self._load_existing_textures(level_num)
             else:
-                print("🎨 Generating new textures...")
-                self.texture_cache = self.ai_pipeline.generate_all_textures(num_levels=3)
+                logger.debug("Generating new level %d textures", level_num)
+                with self._loading_lock:
+                    pipeline = self.ai_pipeline
+                textures = pipeline.generate_all_textures(
+                    num_levels=NUM_LEVELS, force=force, levels=[level_num]
+                )[level_num]
             
             load_time = time.time() - start_time
-            self.load_times['texture_loading'] = load_time
-            
-            self.textures_ready = True
-            self.textures_loading = False
-            
-            print(f"✅ Textures loaded in {load_time:.2f}s")
+            self.load_times[f'texture_loading_level_{level_num}'] = load_time
+            logger.debug("Level %d textures loaded in %.2fs", level_num, load_time)
             
         except Exception as e:
-            print(f"❌ Error loading textures: {e}")
-            self.textures_loading = False
-            # Create empty cache as fallback
-            self.texture_cache = {1: {}, 2: {}, 3: {}}
-            self.textures_ready = True
-    
-    def _textures_exist_on_disk(self):
-        """Check if all required textures exist on disk"""
-        texture_dir = os.path.join(os.path.dirname(__file__), "assets", "textures")
-        
-        required_textures = [
-            "level_1_background.png", "level_1_platform.png", "level_1_enemy.png",
-            "level_2_background.png", "level_2_platform.png", "level_2_enemy.png", 
-            "level_3_background.png", "level_3_platform.png", "level_3_enemy.png", "level_3_boss.png"
-        ]
+            logger.error("Error loading level %d textures: %s", level_num, e)
+            # Empty cache entry as fallback
+            textures = {}
         
-        for texture in required_textures:
-            if not os.path.exists(os.path.join(texture_dir, texture)):
-                return False
-        
-        return True
+        with self._loading_lock:
+            self.texture_cache[level_num] = textures
+            self._levels_loading.discard(level_num)
+            self._level_ready_events[level_num].set()
     
-    def _load_existing_textures(self):
-        """Load existing texture file paths into cache"""
-        texture_dir = os.path.join(os.path.dirname(__file__), "assets", "textures")
+    def _textures_exist_on_disk(self, level_num):
+        """Check if a level's required textures exist on disk (one directory read)"""
+        try:
+            with os.scandir(TEXTURE_DIR) as entries:
+                existing = {entry.name for entry in entries}
+        except FileNotFoundError:
+            return False
         
-        texture_cache = {
-            1: {
-                'background': os.path.join(texture_dir, "level_1_background.png"),
-                'platform': os.path.join(texture_dir, "level_1_platform.png"),
-                'enemy': os.path.join(texture_dir, "level_1_enemy.png")
-            },
-            2: {
-                'background': os.path.join(texture_dir, "level_2_background.png"),
-                'platform': os.path.join(texture_dir, "level_2_platform.png"),
-                'enemy': os.path.join(texture_dir, "level_2_enemy.png")
-            },
-            3: {
-                'background': os.path.join(texture_dir, "level_3_background.png"),
-                'platform': os.path.join(texture_dir, "level_3_platform.png"),
-                'enemy': os.path.join(texture_dir, "level_3_enemy.png"),
-                'boss': os.path.join(texture_dir, "level_3_boss.png")
-            }
+        return all(
+            f"level_{level_num}_{texture_type}.png" in existing
+            for texture_type in level_texture_types(level_num)
+        )
+    
+    def _load_existing_textures(self, level_num):
+        """Load a level's existing texture file paths"""
+        return {
+            texture_type: os.path.join(TEXTURE_DIR, f"level_{level_num}_{texture_type}.png")
+            for texture_type in level_texture_types(level_num)
         }
-        
-        return texture_cache
     
     def get_textures(self, level_num):
-        """Get textures for a specific level (blocking if not ready)"""
+        """Get textures for a specific level (blocking until that level is ready)"""
+        ready_event = self._level_ready_events.get(level_num)
+        if ready_event is None:
+            return {}
+        
         # If textures aren't ready yet, show loading message
-        if not self.textures_ready:
-            if not self.textures_loading:
-                self._start_background_loading()
-            
-            print("⏳ Waiting for textures to load...")
-            # Wait for textures to be ready (with timeout)
-            timeout = 30  # 30 second timeout
-            start_wait = time.time()
+        if not ready_event.is_set():
+            self._start_background_loading(level_num)
             
-            while not self.textures_ready and (time.time() - start_wait) < timeout:
-                time.sleep(0.1)
-            
-            if not self.textures_ready:
-                print("⚠️ Texture loading timed out, using fallback")
+            logger.debug("Waiting for level %d textures to load", level_num)
+            # Block until the loader signals completion (30 second timeout)
+            if not ready_event.wait(timeout=30):
+                logger.warning("Level %d texture loading timed out, using fallback", level_num)
                 return {}
         
         return self.texture_cache.get(level_num, {})
@@ -158,32 +212,36 @@ class GameManager:
         cache_key = f"{level_num}_{is_boss_room}"
         
         if cache_key not in self.level_cache:
-            print(f"⚡ Preloading level {level_num} (boss: {is_boss_room})...")
-            
-            # Import here to avoid circular imports
-            from level_factory import get_level_factory
-            
-            start_time = time.time()
-            factory = get_level_factory()
-            level = factory.create_level(level_num, is_boss_room, self)
-            load_time = time.time() - start_time
-            
-            self.level_cache[cache_key] = level
-            self.load_times[f'level_{cache_key}'] = load_time
-            
-            print(f"✅ Level {level_num} preloaded in {load_time:.3f}s")
+            logger.debug("Preloading level %d (boss: %s)", level_num, is_boss_room)
+            self.level_cache[cache_key] = self._create_level(level_num, is_boss_room)
         
         return self.level_cache[cache_key]
     
     def get_level(self, level_num, is_boss_room=False):
-        """Get a level instance (from cache if available)"""
+        """
+        Get a fresh level instance to play, using the preloaded one if available
+        (handed out once, so a replayed level never keeps its defeated enemies or opened chests)
+        """
         cache_key = f"{level_num}_{is_boss_room}"
         
-        if cache_key in self.level_cache:
-            print(f"⚡ Using cached level {level_num}")
-            return self.level_cache[cache_key]
-        else:
-            return self.preload_level(level_num, is_boss_room)
+        level = self.level_cache.pop(cache_key, None)
+        if level is not None:
+            logger.debug("Using preloaded level %d", level_num)
+            return level
+        return self._create_level(level_num, is_boss_room)
+    
+    def _create_level(self, level_num, is_boss_room):
+        """Create a level instance from the factory's cached template"""
+        # Import here to avoid circular imports
+        from level_factory import get_level_factory
+        
+        start_time = time.time()
+        level = get_level_factory().create_level(level_num, is_boss_room, self)
+        load_time = time.time() - start_time
+        
+        self.load_times[f'level_{level_num}_{is_boss_room}'] = load_time
+        logger.debug("Level %d created in %.3fs", level_num, load_time)
+        return level
     
     def clear_level_cache(self):
         """Clear level cache to free memory"""
@@ -202,10 +260,15 @@ class GameManager:
     def regenerate_textures(self):
         """Force regeneration of textures"""
         print("🔄 Regenerating textures...")
-        self.textures_ready = False
-        self.textures_loading = False
-        self.texture_cache.clear()
-        self._start_background_loading()
+        with self._loading_lock:
+            if self.textures_loading:
+                print("⏳ Texture loading already in progress")
+                return
+            for event in self._level_ready_events.values():
+                event.clear()
+            self.texture_cache.clear()
+            for level_num in LEVEL_NUMS:
+                self._start_background_loading(level_num, force=True)
 
 
 # Global instance
@@ -9,6 +9,8 @@ This module provides ultra-fast level creation through:
 """
 
 import pygame
+import collections
+import functools
 import json
 import os
 import random
@@ -16,112 +18,221 @@ from settings import *
 from sprites import Platform, Enemy, LootChest, HealthPickup, Door
 
 
+PLATFORM_WIDTH = 120
+PLATFORM_HEIGHT = 20
+HEALTH_PICKUP_AMOUNT = 25
+
+# Layout records (named tuples: fixed fields, no per-entry dict)
+PlatformSpec = collections.namedtuple('PlatformSpec', 'x y width height',
+                                      defaults=(PLATFORM_WIDTH, PLATFORM_HEIGHT))
+# Enemies patrol the platform at platform_id (an index into the level's platforms)
+EnemySpec = collections.namedtuple('EnemySpec', 'x y enemy_type platform_id')
+ChestSpec = collections.namedtuple('ChestSpec', 'x y chest_type')
+HealthPickupSpec = collections.namedtuple('HealthPickupSpec', 'x y health_value',
+                                          defaults=(HEALTH_PICKUP_AMOUNT,))
+DoorSpec = collections.namedtuple('DoorSpec', 'x y door_type')
+
+
+def _specs(spec_type, rows):
+    """Build an immutable tuple of layout records from plain rows"""
+    return tuple(spec_type(*row) for row in rows)
+
+
+# Level layouts (immutable, so they are built once instead of on every template).
+# Rows are (x, y) for platforms/pickups, (x, y, type) for chests/doors and
+# (x, y, type, platform index) for enemies.
+REGULAR_LEVEL_WIDTH = 3200
+BOSS_ROOM_WIDTH = 1600
+
+# Exit door sits on the floor near the end of the level
+EXIT_DOOR_X = REGULAR_LEVEL_WIDTH - 100
+EXIT_DOOR_Y = WINDOW_HEIGHT - 120
+
+LEVEL_LAYOUTS = {
+    # Regular levels
+    False: {
+        'width': REGULAR_LEVEL_WIDTH,
+        'platforms': _specs(PlatformSpec, (
+            (200, 520), (400, 470), (650, 430), (850, 380),
+            (1050, 430), (1250, 500), (1450, 430), (1650, 380),
+            (1900, 470), (2050, 420), (2200, 370), (2350, 320),
+            (2500, 370), (2650, 420), (2800, 470), (3000, 370)
+        )),
+        'enemies': _specs(EnemySpec, (
+            (300, 490, 'basic', 0), (700, 400, 'basic', 2), (1100, 400, 'basic', 4),
+            (1500, 400, 'basic', 6), (2000, 390, 'basic', 9)
+        )),
+        'chests': _specs(ChestSpec, ((500, 440, 'basic'), (1200, 470, 'basic'), (2100, 390, 'basic'))),
+        'health_pickups': _specs(HealthPickupSpec, ((800, 350), (1600, 350), (2400, 290))),
+        'doors': _specs(DoorSpec, ((EXIT_DOOR_X, EXIT_DOOR_Y, 'exit'),)),
+    },
+    # Boss rooms: fewer platforms, the boss and a victory chest
+    True: {
+        'width': BOSS_ROOM_WIDTH,
+        'platforms': _specs(PlatformSpec, ((200, 520), (500, 470), (800, 420), (1100, 470), (1400, 520))),
+        'enemies': _specs(EnemySpec, ((BOSS_ROOM_WIDTH // 2, 300, 'boss', 2),)),
+        'chests': _specs(ChestSpec, ((BOSS_ROOM_WIDTH // 2, 490, 'victory'),)),
+        'health_pickups': (),
+        'doors': (),
+    },
+}
+
+# Basic enemies stand this far above the top of the platform they patrol
+ENEMY_PLATFORM_OFFSET = 30
+
+# Catch enemy entries pointing at the wrong platform index when layouts are edited
+assert all(
+    enemy.y + ENEMY_PLATFORM_OFFSET == layout['platforms'][enemy.platform_id].y
+    for layout in LEVEL_LAYOUTS.values()
+    for enemy in layout['enemies']
+    if enemy.enemy_type != 'boss'
+), "Each basic enemy must stand ENEMY_PLATFORM_OFFSET px above its platform"
+
+# Enemy sprite sizes
+ENEMY_SIZE = (40, 40)
+BOSS_SIZE = (80, 80)
+
+# Possible chest loot values (same 10-50 range LootChest rolls on its own)
+CHEST_LOOT_VALUES = range(10, 51)
+
+@functools.lru_cache(maxsize=64)
+def _load_surface(path, mtime, alpha, convert):
+    """
+    Decode a texture and convert it to the display format (mtime in the key drops stale files,
+    convert in the key drops surfaces loaded before the display existed)
+    """
+    surface = pygame.image.load(path)
+    
+    # Match the display format once so later blits skip per-pixel conversion;
+    # opaque textures use the cheaper convert()
+    if convert:
+        surface = surface.convert_alpha() if alpha else surface.convert()
+    return surface
+
+
+def load_texture(path, alpha=True):
+    """
+    Load a texture surface, reusing the decoded surface until the file changes
+    Returns: pygame.Surface, or None if the file is missing or unreadable
+    """
+    if not path:
+        return None
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    
+    try:
+        return _load_surface(path, mtime, alpha, pygame.display.get_surface() is not None)
+    except (pygame.error, OSError):
+        return None
+
+
+# Scaled surfaces keyed by (path, size, alpha), stored as (source surface, scaled surface)
+_scaled_texture_cache = {}
+
+
+def load_scaled_texture(path, size, alpha=True):
+    """
+    Load a texture scaled to size, shared by every sprite that uses it
+    Returns: pygame.Surface, or None if the texture is unavailable
+    """
+    source = load_texture(path, alpha)
+    if source is None:
+        return None
+    
+    key = (path, tuple(size), alpha)
+    cached = _scaled_texture_cache.get(key)
+    if cached is not None and cached[0] is source:
+        return cached[1]
+    
+    scaled = pygame.transform.scale(source, key[1])
+    if alpha:
+        # RLE-encode sprite textures; mostly-opaque alpha blits run ~2x faster
+        scaled.set_alpha(255, pygame.RLEACCEL)
+    _scaled_texture_cache[key] = (source, scaled)
+    return scaled
+
+
+_boss_fallback = None
+
+
+def _boss_fallback_surface():
+    """Plain red boss surface for when no boss texture exists (created once, shared)"""
+    global _boss_fallback
+    if _boss_fallback is None:
+        _boss_fallback = pygame.Surface(BOSS_SIZE)
+        _boss_fallback.fill(RED)
+    return _boss_fallback
+
+
 class LevelTemplate:
     """Lightweight level template that stores level data without creating sprites"""
     
+    __slots__ = (
+        'level_num', 'is_boss_room', 'layout', 'width', 'height', 'seed',
+        'platform_data', 'enemy_data', 'chest_data', 'health_pickup_data', 'door_data',
+    )
+    
     def __init__(self, level_num, is_boss_room=False):
         self.level_num = level_num
         self.is_boss_room = is_boss_room
-        self.width = 3200 if not is_boss_room else 1600
+        self.layout = LEVEL_LAYOUTS[bool(is_boss_room)]
+        self.width = self.layout['width']
         self.height = WINDOW_HEIGHT
         
-        # Pre-computed level data (no sprite creation)
-        self.platform_data = []
-        self.enemy_data = []
-        self.chest_data = []
-        self.health_pickup_data = []
-        self.door_data = []
+        # Seed for this level's random rolls, so a level plays out the same every time
+        self.seed = level_num * 1337 + (1 if is_boss_room else 0)
+        
+        # Pre-computed level data as tuples of layout records (no sprite creation)
+        self.platform_data = ()
+        self.enemy_data = ()
+        self.chest_data = ()
+        self.health_pickup_data = ()
+        self.door_data = ()
         
         # Generate level layout data (fast)
         self._generate_level_data()
     
     def _generate_level_data(self):
-        """Generate level layout data without creating sprites (ultra-fast)"""
-        if self.is_boss_room:
-            self._generate_boss_room_data()
-        else:
-            self._generate_regular_level_data()
-    
-    def _generate_regular_level_data(self):
-        """Generate data for regular levels"""
-        # Platform positions (just coordinates, no sprites)
-        platform_positions = [
-            (200, 520), (400, 470), (650, 430), (850, 380),
-            (1050, 430), (1250, 500), (1450, 430), (1650, 380),
-            (1900, 470), (2050, 420), (2200, 370), (2350, 320),
-            (2500, 370), (2650, 420), (2800, 470), (3000, 370)
-        ]
-        
-        for i, (x, y) in enumerate(platform_positions):
-            # Add some randomization based on level
-            y_offset = (self.level_num - 1) * 10
-            self.platform_data.append({
-                'x': x, 'y': y - y_offset, 'width': 120, 'height': 20, 'id': i
-            })
-        
-        # Enemy positions
-        enemy_positions = [(300, 490), (700, 400), (1100, 400), (1500, 400), (2000, 390)]
-        for i, (x, y) in enumerate(enemy_positions):
-            self.enemy_data.append({
-                'x': x, 'y': y, 'enemy_type': 'basic', 'id': i
-            })
-        
-        # Chest positions
-        chest_positions = [(500, 440), (1200, 470), (2100, 390)]
-        for i, (x, y) in enumerate(chest_positions):
-            self.chest_data.append({
-                'x': x, 'y': y, 'chest_type': 'basic', 'id': i
-            })
-        
-        # Health pickup positions
-        health_positions = [(800, 350), (1600, 350), (2400, 290)]
-        for i, (x, y) in enumerate(health_positions):
-            self.health_pickup_data.append({
-                'x': x, 'y': y, 'health_amount': 25, 'id': i
-            })
+        """Generate level layout data from the shared layout table (ultra-fast)"""
+        layout = self.layout
         
-        # Door position (end of level)
-        self.door_data.append({
-            'x': self.width - 100, 'y': WINDOW_HEIGHT - 120, 'door_type': 'exit', 'id': 0
-        })
-    
-    def _generate_boss_room_data(self):
-        """Generate data for boss rooms"""
-        # Fewer platforms in boss room
-        platform_positions = [
-            (200, 520), (500, 470), (800, 420), (1100, 470), (1400, 520)
-        ]
-        
-        for i, (x, y) in enumerate(platform_positions):
-            self.platform_data.append({
-                'x': x, 'y': y, 'width': 120, 'height': 20, 'id': i
-            })
-        
-        # Boss enemy
-        self.enemy_data.append({
-            'x': self.width // 2, 'y': 300, 'enemy_type': 'boss', 'id': 0
-        })
+        # Regular levels shift their platforms up a little per level
+        y_offset = 0 if self.is_boss_room else (self.level_num - 1) * 10
+        if y_offset:
+            self.platform_data = tuple(spec._replace(y=spec.y - y_offset) for spec in layout['platforms'])
+        else:
+            self.platform_data = layout['platforms']
         
-        # Victory chest
-        self.chest_data.append({
-            'x': self.width // 2, 'y': 490, 'chest_type': 'victory', 'id': 0
-        })
+        # Everything else is the same in every level, so the layout records are shared as-is
+        self.enemy_data = layout['enemies']
+        self.chest_data = layout['chests']
+        self.health_pickup_data = layout['health_pickups']
+        self.door_data = layout['doors']
 
 
 class OptimizedLevel:
     """Optimized level that creates sprites only when needed"""
     
+    __slots__ = (
+        'template', 'game_manager', '_platforms', '_platform_list', '_enemies', '_chests',
+        '_health_pickups', '_doors', '_background', '_static_layer', '_textures',
+    )
+    
     def __init__(self, template, game_manager=None):
         self.template = template
         self.game_manager = game_manager
         
         # Sprite groups (created lazily)
         self._platforms = None
+        self._platform_list = None
         self._enemies = None
         self._chests = None
         self._health_pickups = None
         self._doors = None
         self._background = None
+        self._static_layer = None
         
         # Textures (loaded lazily)
         self._textures = None
@@ -178,98 +289,109 @@ class OptimizedLevel:
             self._load_background()
         return self._background
     
+    @property
+    def static_layer(self):
+        """Level-sized surface with the background and every platform pre-drawn"""
+        if self._static_layer is None:
+            self._build_static_layer()
+        return self._static_layer
+    
     def _create_platforms(self):
         """Create platform sprites from template data"""
-        self._platforms = pygame.sprite.Group()
-        
         # Load platform texture
         textures = self._get_textures()
         platform_texture = textures.get('platform')
         
-        for platform_data in self.template.platform_data:
-            platform = Platform(
-                platform_data['x'], 
-                platform_data['y'], 
-                platform_data['width'], 
-                platform_data['height']
-            )
-            
-            # Apply texture if available
-            if platform_texture and os.path.exists(platform_texture):
-                try:
-                    texture_surface = pygame.image.load(platform_texture)
-                    platform.image = pygame.transform.scale(texture_surface, (platform_data['width'], platform_data['height']))
-                except:
-                    pass  # Use default if texture loading fails
-            
-            self._platforms.add(platform)
+        platforms = [Platform(spec.x, spec.y, spec.width, spec.height) for spec in self.template.platform_data]
+        
+        # Apply texture if available (platforms of the same size share one scaled surface)
+        if platform_texture:
+            images = {}
+            for platform in platforms:
+                size = platform.rect.size
+                if size not in images:
+                    images[size] = load_scaled_texture(platform_texture, size, alpha=False)
+                if images[size] is not None:
+                    platform.image = images[size]
+        
+        # One batched add instead of one call per sprite; the list keeps template
+        # order so enemies can look up their platform by index
+        self._platform_list = platforms
+        self._platforms = pygame.sprite.Group(*platforms)
     
     def _create_enemies(self):
         """Create enemy sprites from template data"""
-        self._enemies = pygame.sprite.Group()
+        enemies = []
+        
+        # Enemies patrol the platform their template entry points at
+        if self._platforms is None:
+            self._create_platforms()
+        platform_list = self._platform_list
         
         # Load enemy texture
         textures = self._get_textures()
-        enemy_texture = textures.get('enemy')
-        boss_texture = textures.get('boss')
+        enemy_texture = load_scaled_texture(textures.get('enemy'), ENEMY_SIZE)
+        boss_texture = load_scaled_texture(textures.get('boss'), BOSS_SIZE)
         
-        for enemy_data in self.template.enemy_data:
-            if enemy_data['enemy_type'] == 'boss':
-                enemy = Enemy(enemy_data['x'], enemy_data['y'], is_boss=True)
-                if boss_texture and os.path.exists(boss_texture):
-                    try:
-                        texture_surface = pygame.image.load(boss_texture)
-                        enemy.image = pygame.transform.scale(texture_surface, (80, 80))
-                    except:
-                        pass
+        for spec in self.template.enemy_data:
+            platform = platform_list[spec.platform_id]
+            if spec.enemy_type == 'boss':
+                enemy = Enemy(spec.x, spec.y, platform, enemy_type='boss')
+                enemy.set_texture(boss_texture if boss_texture is not None else _boss_fallback_surface(), BOSS_SIZE)
             else:
-                enemy = Enemy(enemy_data['x'], enemy_data['y'])
-                if enemy_texture and os.path.exists(enemy_texture):
-                    try:
-                        texture_surface = pygame.image.load(enemy_texture)
-                        enemy.image = pygame.transform.scale(texture_surface, (40, 40))
-                    except:
-                        pass
+                enemy = Enemy(spec.x, spec.y, platform)
+                if enemy_texture is not None:
+                    enemy.set_texture(enemy_texture, ENEMY_SIZE)
             
-            self._enemies.add(enemy)
+            enemies.append(enemy)
+        
+        self._enemies = pygame.sprite.Group(*enemies)
     
     def _create_chests(self):
         """Create chest sprites from template data"""
-        self._chests = pygame.sprite.Group()
+        chest_data = self.template.chest_data
         
-        for chest_data in self.template.chest_data:
-            chest = LootChest(chest_data['x'], chest_data['y'])
-            self._chests.add(chest)
+        # Roll every chest's loot in one call from the level's own seeded generator
+        # (deterministic per level and free of the shared global random state)
+        rng = random.Random(self.template.seed)
+        loot_values = rng.choices(CHEST_LOOT_VALUES, k=len(chest_data))
+        self._chests = pygame.sprite.Group(
+            *[LootChest(spec.x, spec.y, loot) for spec, loot in zip(chest_data, loot_values)]
+        )
     
     def _create_health_pickups(self):
         """Create health pickup sprites from template data"""
-        self._health_pickups = pygame.sprite.Group()
-        
-        for health_data in self.template.health_pickup_data:
-            health_pickup = HealthPickup(health_data['x'], health_data['y'])
-            self._health_pickups.add(health_pickup)
+        self._health_pickups = pygame.sprite.Group(
+            *[HealthPickup(spec.x, spec.y, spec.health_value) for spec in self.template.health_pickup_data]
+        )
     
     def _create_doors(self):
         """Create door sprites from template data"""
-        self._doors = pygame.sprite.Group()
-        
-        for door_data in self.template.door_data:
-            door = Door(door_data['x'], door_data['y'])
-            self._doors.add(door)
+        self._doors = pygame.sprite.Group(
+            *[Door(spec.x, spec.y) for spec in self.template.door_data]
+        )
     
     def _load_background(self):
         """Load background texture"""
         textures = self._get_textures()
-        background_texture = textures.get('background')
-        
-        if background_texture and os.path.exists(background_texture):
-            try:
-                self._background = pygame.image.load(background_texture)
-                self._background = pygame.transform.scale(self._background, (self.width, self.height))
-            except:
-                self._background = None
+        self._background = load_scaled_texture(textures.get('background'), (self.width, self.height), alpha=False)
+    
+    def _build_static_layer(self):
+        """Bake the static scenery once so drawing it costs a single blit per frame"""
+        background = self.background
+        if background is not None:
+            # Copy, since the scaled background surface is shared between level instances
+            layer = background.copy()
         else:
-            self._background = None
+            layer = pygame.Surface((self.width, self.height))
+            layer.fill(BLACK)
+        
+        # Platforms never move, so they can live in the same surface as the background
+        if self._platforms is None:
+            self._create_platforms()
+        layer.blits([(platform.image, platform.rect) for platform in self._platform_list], doreturn=False)
+        
+        self._static_layer = layer
     
     def _get_textures(self):
         """Get textures for this level (cached)"""
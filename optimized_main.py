@@ -9,8 +9,10 @@ This version implements all performance optimizations:
 """
 
 import pygame
+import functools
 import sys
 import time
+import logging
 from pygame.locals import *
 from settings import *
 from sprites import Player, Platform, Enemy, LootChest, Camera, HealthPickup
@@ -20,6 +22,8 @@ from game_manager import get_game_manager
 from dotenv import load_dotenv
 load_dotenv()
 
+logger = logging.getLogger("optimized_main")
+
 # Initialize pygame
 pygame.init()
 
@@ -31,11 +35,26 @@ clock = pygame.time.Clock()
 # Load fonts
 font = pygame.font.SysFont(None, 36)
 
+
+@functools.lru_cache(maxsize=128)
+def render_text(text_font, text, color):
+    """Render antialiased text, reusing the surface while the text stays the same"""
+    return text_font.render(text, True, color)
+
 # Game states
 STATE_MENU = 0
 STATE_PLAYING = 1
 STATE_GAME_OVER = 2
 
+# The player can use a chest or door whose centre is less than this many pixels away on both axes
+INTERACTION_RANGE = 60
+
+
+def _interaction_zone(rect):
+    """Area the player's centre must be in to interact with an object at rect"""
+    size = 2 * INTERACTION_RANGE - 1
+    return pygame.Rect(rect.centerx - (INTERACTION_RANGE - 1), rect.centery - (INTERACTION_RANGE - 1), size, size)
+
 
 class OptimizedGame:
     """Optimized game class with minimal startup overhead"""
@@ -47,8 +66,9 @@ class OptimizedGame:
         self.state = STATE_MENU
         self.current_level = 1
         
-        # Get game manager (textures load in background)
+        # Get game manager and start loading textures in the background
         self.game_manager = get_game_manager()
+        self.game_manager.start()
         
         # Initialize with minimal overhead - no level preloading!
         self.level = None
@@ -65,12 +85,27 @@ class OptimizedGame:
         self.popup_font = pygame.font.SysFont(None, 24)
         self.popups = []
         
+        # Interaction prompts never change, so they are rendered once up front
+        self.chest_prompt = self.popup_font.render("Press DOWN to open chest!", True, WHITE)
+        self.door_prompt = self.popup_font.render("Press DOWN to enter door!", True, WHITE)
+        
         # Game state
         self.is_boss_room = False
         self.attack_effect = None
         self.attack_effect_timer = 0
         self.nearby_chest = None
         self.nearby_door = None
+        self.down_pressed = False  # DOWN went down this frame (opening/entering is a one-shot action)
+        self._chest_list = []
+        self._chest_zones = []
+        self._door_list = []
+        self._door_zones = []
+        
+        # Attack overlay, created once and drawn through the attack rect's size
+        # (large enough for the melee attack area)
+        self.attack_overlay = pygame.Surface((80, 100))
+        self.attack_overlay.fill(WHITE)
+        self.attack_overlay.set_alpha(100)
         
         # Performance tracking
         self.level_load_times = {}
@@ -93,17 +128,23 @@ class OptimizedGame:
     def load_level(self, level_num, is_boss_room=False):
         """Load level with optimized caching (ultra-fast)"""
         start_time = time.time()
-        print(f"⚡ Loading level {level_num} (boss: {is_boss_room})...")
+        logger.debug("Loading level %d (boss: %s)", level_num, is_boss_room)
         
         # Create player
         self.player = Player(100, 300)
         
-        # Get level from optimized cache (instant after first load)
+        # Get a fresh level built from the cached template (instant after first load)
         self.level = self.game_manager.get_level(level_num, is_boss_room)
         
         # Get level components (lazy loading - only creates sprites when accessed)
         self.platforms, self.enemies, self.chests, self.health_pickups, self.doors, self.background = self.level.create_level(level_num, is_boss_room)
         
+        # Chests and doors never move, so their interaction zones are built once per level
+        self._chest_list = self.chests.sprites()
+        self._chest_zones = [_interaction_zone(chest.rect) for chest in self._chest_list]
+        self._door_list = self.doors.sprites()
+        self._door_zones = [_interaction_zone(door.rect) for door in self._door_list]
+        
         # Set state
         self.is_boss_room = is_boss_room
         
@@ -113,7 +154,7 @@ class OptimizedGame:
         # Track performance
         load_time = time.time() - start_time
         self.level_load_times[f'level_{level_num}_{is_boss_room}'] = load_time
-        print(f"✅ Level {level_num} loaded in {load_time:.3f}s")
+        logger.debug("Level %d loaded in %.3fs", level_num, load_time)
     
     def handle_events(self):
         """Handle game events"""
@@ -126,6 +167,8 @@ class OptimizedGame:
                 if event.type == KEYDOWN:
                     if event.key == K_SPACE:
                         self.player.jump()
+                    if event.key == K_DOWN:  # Open chest / enter door
+                        self.down_pressed = True
                     if event.key == K_x:  # Melee attack
                         self.attack_effect, enemies_hit = self.player.melee_attack(self.enemies)
                         if self.attack_effect:
@@ -145,23 +188,33 @@ class OptimizedGame:
     def update(self):
         """Update game state"""
         if self.state == STATE_PLAYING and self.level is not None:
-            # Handle movement
+            # Bind per-frame objects to locals (collisions may load a new level, so the
+            # checks after them read the attributes again)
+            player = self.player
+            enemies = self.enemies
+            
+            # Read the keyboard once per frame
             keys = pygame.key.get_pressed()
-            self.player.vel_x = 0
+            left, right = keys[K_LEFT], keys[K_RIGHT]
             
-            if keys[K_LEFT]:
-                self.player.vel_x = -self.player.speed
-            if keys[K_RIGHT]:
-                self.player.vel_x = self.player.speed
+            # Handle movement
+            player.vel_x = 0
+            if left:
+                player.vel_x = -PLAYER_SPEED
+            if right:
+                player.vel_x = PLAYER_SPEED
             
             # Update player
-            self.player.update(self.platforms)
+            player.update(self.platforms, enemies)
             
             # Update camera
-            self.camera.update(self.player)
+            self.camera.update(player)
             
             # Update enemies
-            self.enemies.update()
+            enemies.update(player)
+            
+            # Bob the health pickups (one Group.update call for all of them)
+            self.health_pickups.update()
             
             # Update attack effect timer
             if self.attack_effect_timer > 0:
@@ -169,8 +222,9 @@ class OptimizedGame:
                 if self.attack_effect_timer <= 0:
                     self.attack_effect = None
             
-            # Check collisions
-            self._check_collisions()
+            # Check collisions (a DOWN press is used up by this frame's chest/door check)
+            self._check_collisions(self.down_pressed)
+            self.down_pressed = False
             
             # Check game over conditions
             if self.player.health <= 0:
@@ -180,50 +234,57 @@ class OptimizedGame:
             if len(self.enemies) == 0 and not self.is_boss_room:
                 self.progress_to_next_level()
     
-    def _check_collisions(self):
-        """Check all game collisions"""
+    def _check_collisions(self, down):
+        """Check all game collisions (down: whether DOWN was pressed this frame)"""
+        player = self.player
+        enemies = self.enemies
+        
         # Enemy collisions
-        enemy_hits = pygame.sprite.spritecollide(self.player, self.enemies, False)
+        enemy_hits = pygame.sprite.spritecollide(player, enemies, False)
         for enemy in enemy_hits:
-            if not self.player.invulnerable:
-                self.player.take_damage(enemy.damage)
+            if not player.invulnerable:
+                player.take_damage(enemy.attack_damage)
         
-        # Chest proximity
-        self.nearby_chest = None
-        for chest in self.chests:
-            if abs(self.player.rect.centerx - chest.rect.centerx) < 60 and abs(self.player.rect.centery - chest.rect.centery) < 60:
-                self.nearby_chest = chest
-                keys = pygame.key.get_pressed()
-                if keys[K_DOWN] and not chest.opened:
-                    chest.open()
-                    self.player.score += chest.value
-                break
-        
-        # Door proximity
-        self.nearby_door = None
-        for door in self.doors:
-            if abs(self.player.rect.centerx - door.rect.centerx) < 60 and abs(self.player.rect.centery - door.rect.centery) < 60:
-                if len(self.enemies) == 0:
-                    door.activated = True
-                    self.nearby_door = door
-                    keys = pygame.key.get_pressed()
-                    if keys[K_DOWN]:
-                        self.progress_to_next_level()
-                break
+        # Projectile hits (groupcollide does the pairwise rect tests in C); a projectile
+        # is used up on its first hit and goes back to the player's projectile pool
+        projectile_hits = pygame.sprite.groupcollide(player.projectiles, enemies, True, False)
+        for projectile, enemies_hit in projectile_hits.items():
+            for enemy in enemies_hit:
+                if enemy.take_damage(projectile.damage):
+                    player.score += enemy.score_value
         
         # Health pickup collisions
-        health_hits = pygame.sprite.spritecollide(self.player, self.health_pickups, True)
+        health_hits = pygame.sprite.spritecollide(player, self.health_pickups, True)
         for health_pickup in health_hits:
-            self.player.heal(health_pickup.health_amount)
+            player.health = min(player.max_health, player.health + health_pickup.collect())
+        
+        # Chest and door proximity: one C-level collidelist over the precomputed zones each
+        player_center = pygame.Rect(player.rect.center, (1, 1))
+        
+        index = player_center.collidelist(self._chest_zones)
+        nearby_chest = self._chest_list[index] if index >= 0 else None
+        self.nearby_chest = nearby_chest
+        if nearby_chest and down and not nearby_chest.opened:
+            player.score += nearby_chest.open()
+        
+        # Doors come last, since entering one loads the next level
+        self.nearby_door = None
+        index = player_center.collidelist(self._door_zones)
+        if index >= 0 and len(enemies) == 0:
+            door = self._door_list[index]
+            door.activated = True
+            self.nearby_door = door
+            if down:
+                self.progress_to_next_level()
     
     def progress_to_next_level(self):
         """Progress to next level"""
-        if self.current_level < 3:
+        if self.current_level < NUM_LEVELS:
             self.current_level += 1
             self.load_level(self.current_level)
-        elif self.current_level == 3 and not self.is_boss_room:
+        elif self.current_level == NUM_LEVELS and not self.is_boss_room:
             # Go to boss room
-            self.load_level(3, is_boss_room=True)
+            self.load_level(NUM_LEVELS, is_boss_room=True)
         else:
             # Victory!
             self.state = STATE_GAME_OVER
@@ -234,44 +295,42 @@ class OptimizedGame:
         
         if self.state == STATE_MENU:
             # Menu screen
-            title_text = font.render("AI GAME - OPTIMIZED", True, WHITE)
-            start_text = font.render("Press ENTER to start", True, WHITE)
+            title_text = render_text(font, "AI GAME - OPTIMIZED", WHITE)
+            start_text = render_text(font, "Press ENTER to start", WHITE)
             screen.blit(title_text, (WINDOW_WIDTH // 2 - 150, WINDOW_HEIGHT // 2 - 50))
             screen.blit(start_text, (WINDOW_WIDTH // 2 - 120, WINDOW_HEIGHT // 2))
             
             # Show performance stats
             stats = self.game_manager.get_performance_stats()
             status_text = f"Textures: {'Ready' if stats['textures_ready'] else 'Loading...'}"
-            status_surface = self.popup_font.render(status_text, True, GREEN if stats['textures_ready'] else YELLOW)
+            status_surface = render_text(self.popup_font, status_text, GREEN if stats['textures_ready'] else YELLOW)
             screen.blit(status_surface, (10, WINDOW_HEIGHT - 30))
         
         elif self.state == STATE_PLAYING and self.level is not None:
-            # Draw background
-            if self.background:
-                screen.blit(self.background, self.camera.apply_to_rect(pygame.Rect(0, 0, self.level.width, self.level.height)))
-            
-            # Draw game objects
-            for platform in self.platforms:
-                screen.blit(platform.image, self.camera.apply(platform))
-            
-            for enemy in self.enemies:
-                screen.blit(enemy.image, self.camera.apply(enemy))
-            
-            for chest in self.chests:
-                screen.blit(chest.image, self.camera.apply(chest))
+            # Camera offset and the level-space rect it shows, computed once per frame
+            offset = self.camera.offset
+            view = pygame.Rect(-offset[0], -offset[1], WINDOW_WIDTH, WINDOW_HEIGHT)
             
-            for health_pickup in self.health_pickups:
-                screen.blit(health_pickup.image, self.camera.apply(health_pickup))
+            # Draw background and platforms: one blit of the visible part of the pre-baked layer
+            screen.blit(self.level.static_layer, (0, 0), view)
             
-            for door in self.doors:
-                screen.blit(door.image, self.camera.apply(door))
+            # Draw the on-screen game objects in a single blits() call, offsetting each rect
+            # by the camera (levels span several screens, so most sprites are culled)
+            visible = view.colliderect
+            screen.blits([
+                (sprite.image, sprite.rect.move(offset))
+                for group in (self.enemies, self.chests, self.health_pickups, self.doors, self.player.projectiles)
+                for sprite in group
+                if visible(sprite.rect)
+            ], doreturn=False)
             
             # Draw player
-            screen.blit(self.player.image, self.camera.apply(self.player))
+            screen.blit(self.player.image, self.player.rect.move(offset))
             
             # Draw attack effect
             if self.attack_effect:
-                screen.blit(self.attack_effect.image, self.camera.apply(self.attack_effect))
+                screen.blit(self.attack_overlay, self.attack_effect.move(offset),
+                            pygame.Rect((0, 0), self.attack_effect.size))
             
             # Draw UI
             self._draw_ui()
@@ -279,14 +338,14 @@ class OptimizedGame:
         elif self.state == STATE_GAME_OVER:
             # Game over screen
             if self.player and self.player.health <= 0:
-                game_over_text = font.render("GAME OVER", True, RED)
-                restart_text = font.render("Press R to restart", True, WHITE)
+                game_over_text = render_text(font, "GAME OVER", RED)
+                restart_text = render_text(font, "Press R to restart", WHITE)
                 screen.blit(game_over_text, (WINDOW_WIDTH // 2 - 100, WINDOW_HEIGHT // 2 - 50))
                 screen.blit(restart_text, (WINDOW_WIDTH // 2 - 120, WINDOW_HEIGHT // 2 + 10))
             else:
-                victory_text = font.render("VICTORY!", True, GREEN)
-                final_score_text = font.render(f"Final Score: {self.player.score if self.player else 0}", True, WHITE)
-                restart_text = font.render("Press R to Play Again", True, WHITE)
+                victory_text = render_text(font, "VICTORY!", GREEN)
+                final_score_text = render_text(font, f"Final Score: {self.player.score if self.player else 0}", WHITE)
+                restart_text = render_text(font, "Press R to Play Again", WHITE)
                 screen.blit(victory_text, (WINDOW_WIDTH // 2 - 80, WINDOW_HEIGHT // 2 - 80))
                 screen.blit(final_score_text, (WINDOW_WIDTH // 2 - 120, WINDOW_HEIGHT // 2 - 20))
                 screen.blit(restart_text, (WINDOW_WIDTH // 2 - 140, WINDOW_HEIGHT // 2 + 40))
@@ -305,34 +364,35 @@ class OptimizedGame:
         health_bar_fill = pygame.Rect(10, 10, int(health_bar_width * (self.player.health / self.player.max_health)), health_bar_height)
         
         pygame.draw.rect(screen, RED, health_bar_border, 2)
-        pygame.draw.rect(screen, GREEN, health_bar_fill)
+        screen.fill(GREEN, health_bar_fill)  # Solid fill skips draw.rect's shape logic
         
         # Health text
-        health_text = font.render(f"Health: {int(self.player.health)}/{self.player.max_health}", True, WHITE)
+        health_text = render_text(font, f"Health: {int(self.player.health)}/{self.player.max_health}", WHITE)
         screen.blit(health_text, (10, 35))
         
         # Score text
-        score_text = font.render(f"Score: {self.player.score}", True, WHITE)
+        score_text = render_text(font, f"Score: {self.player.score}", WHITE)
         screen.blit(score_text, (10, 70))
         
         # Level text
-        level_text = font.render(f"Level: {self.current_level} {'(Boss)' if self.is_boss_room else ''}", True, WHITE)
+        level_text = render_text(font, f"Level: {self.current_level} {'(Boss)' if self.is_boss_room else ''}", WHITE)
         screen.blit(level_text, (10, 105))
         
         # Interaction prompts
+        dx, dy = self.camera.offset
         if self.nearby_chest and not self.nearby_chest.opened:
-            popup_text = self.popup_font.render("Press DOWN to open chest!", True, WHITE)
-            chest_pos = self.camera.apply(self.nearby_chest)
-            screen.blit(popup_text, (chest_pos.x - 50, chest_pos.y - 30))
+            chest_rect = self.nearby_chest.rect
+            screen.blit(self.chest_prompt, (chest_rect.x + dx - 50, chest_rect.y + dy - 30))
         
         if self.nearby_door and self.nearby_door.activated:
-            popup_text = self.popup_font.render("Press DOWN to enter door!", True, WHITE)
-            door_pos = self.camera.apply(self.nearby_door)
-            screen.blit(popup_text, (door_pos.x - 50, door_pos.y - 30))
+            door_rect = self.nearby_door.rect
+            screen.blit(self.door_prompt, (door_rect.x + dx - 50, door_rect.y + dy - 30))
 
 
 def main():
     """Main game loop with performance monitoring"""
+    # Level-load timings are logged at DEBUG; raise the level to see them
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
     print("🎮 Starting AI Game with Performance Optimizations...")
     
     # Track total startup time
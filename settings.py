@@ -22,3 +22,12 @@ BROWN = (139, 69, 19)
 YELLOW = (255, 255, 0)
 GRAY = (128, 128, 128)
 LIGHT_BLUE = (173, 216, 230)
+
+# Levels and the AI texture types they use
+NUM_LEVELS = 3
+TEXTURE_TYPES = ("background", "platform", "enemy", "boss")
+
+
+def level_texture_types(level_num, num_levels=NUM_LEVELS):
+    """Texture types a level needs (the boss only appears in the final level)"""
+    return [t for t in TEXTURE_TYPES if t != "boss" or level_num == num_levels]
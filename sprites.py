@@ -4,23 +4,56 @@ import math
 from settings import *
 
 class Projectile(pygame.sprite.Sprite):
-    def __init__(self, x, y, direction, damage=15):
+    def __init__(self, x, y, direction, damage=15, pool=None):
         super().__init__()
         self.image = pygame.Surface((10, 5))
         self.image.fill(BLUE)  # Blue projectile
         self.rect = self.image.get_rect()
+        self.speed = 10
+        self.pool = pool  # Pool to return to when killed (None for standalone projectiles)
+        self.reset(x, y, direction, damage)
+    
+    def reset(self, x, y, direction, damage=15):
+        """(Re)launch the projectile from a position, reusing its image and rect"""
         self.rect.x = x
         self.rect.y = y
         self.direction = direction  # 1 for right, -1 for left
-        self.speed = 10
         self.damage = damage
         self.lifetime = 60  # Projectile disappears after 60 frames (1 second)
+        self.active = True
     
     def update(self):
         self.rect.x += self.speed * self.direction
         self.lifetime -= 1
         if self.lifetime <= 0:
             self.kill()
+    
+    def kill(self):
+        super().kill()
+        if self.active:
+            self.active = False
+            if self.pool is not None:
+                self.pool.release(self)
+
+class ProjectilePool:
+    """Free list of projectiles, so sustained firing reuses sprites instead of allocating new ones"""
+    def __init__(self, size=64):
+        self._free = [Projectile(0, 0, 1, pool=self) for _ in range(size)]
+        for projectile in self._free:
+            projectile.active = False
+    
+    def acquire(self, x, y, direction, damage=15):
+        """Get an inactive projectile launched from the given position"""
+        if self._free:
+            projectile = self._free.pop()
+            projectile.reset(x, y, direction, damage)
+            return projectile
+        # Pool exhausted - grow it; the new projectile returns to the pool when killed
+        return Projectile(x, y, direction, damage, pool=self)
+    
+    def release(self, projectile):
+        """Return a killed projectile to the free list"""
+        self._free.append(projectile)
 
 class Player(pygame.sprite.Sprite):
     def __init__(self, x, y):
@@ -43,6 +76,7 @@ class Player(pygame.sprite.Sprite):
         self.melee_damage = 25
         self.ranged_damage = 15
         self.projectiles = pygame.sprite.Group()
+        self.projectile_pool = ProjectilePool()
         
         # Health attributes
         self.max_health = 100
@@ -166,7 +200,7 @@ class Player(pygame.sprite.Sprite):
             # Create projectile at the player's position
             direction = 1 if self.facing_right else -1
             x_pos = self.rect.right if self.facing_right else self.rect.left
-            projectile = Projectile(x_pos, self.rect.centery, direction, self.ranged_damage)
+            projectile = self.projectile_pool.acquire(x_pos, self.rect.centery, direction, self.ranged_damage)
             self.projectiles.add(projectile)
             
             return True
@@ -256,10 +290,12 @@ class Enemy(pygame.sprite.Sprite):
         self.damage_flash = 0  # Visual feedback when taking damage
         self.flash_image = None  # Will store red-tinted image for damage feedback
     
-    def set_texture(self, texture):
+    def set_texture(self, texture, size=(30, 40)):
         """Set a texture for the enemy"""
-        # Scale the texture to match enemy size
-        self.original_image = pygame.transform.scale(texture, (30, 40))
+        # Scale the texture to match enemy size (pre-scaled textures are shared as-is)
+        if texture.get_size() != tuple(size):
+            texture = pygame.transform.scale(texture, size)
+        self.original_image = texture
         self.image = self.original_image
         # Update the rect in case the size changed
         self.rect = self.image.get_rect(topleft=(self.rect.x, self.rect.y))
@@ -389,7 +425,7 @@ class HealthPickup(pygame.sprite.Sprite):
         return 0
 
 class LootChest(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+    def __init__(self, x, y, loot_value=None):
         super().__init__()
         self.image = pygame.Surface((40, 30))
         self.image.fill(YELLOW)
@@ -397,7 +433,8 @@ class LootChest(pygame.sprite.Sprite):
         self.rect.x = x
         self.rect.y = y
         self.opened = False
-        self.loot_value = random.randint(10, 50)
+        # Callers creating many chests can pass pre-rolled values
+        self.loot_value = loot_value if loot_value is not None else random.randint(10, 50)
         self.interaction_distance = 70  # Distance at which player can interact with chest
         self.closed_image = self.image  # Store closed chest image
         self.opened_image = None  # Will store opened chest image
@@ -463,9 +500,10 @@ class Camera:
         self.camera = pygame.Rect(0, 0, width, height)
         self.width = width
         self.height = height
+        self.offset = (0, 0)  # Screen offset of the level, as a plain tuple for the draw loop
         
     def apply(self, entity):
-        return entity.rect.move(self.camera.topleft)
+        return entity.rect.move(self.offset)
         
     def update(self, target):
         # Center the camera on the target
@@ -478,4 +516,5 @@ class Camera:
         x = max(-(self.width - WINDOW_WIDTH), x)  # Right side
         y = max(-(self.height - WINDOW_HEIGHT), y)  # Bottom side
         
-        self.camera = pygame.Rect(x, y, self.width, self.height)
+        self.offset = (x, y)
+        self.camera.topleft = self.offset